@@ -68,7 +68,7 @@ export class PluginLambdasStack extends cdk.NestedStack {
             command: [
               'bash',
               '-c',
-              'pip install --platform manylinux2014_x86_64 --only-binary=:all: --upgrade -r requirements.txt -t /asset-output && cp lambda_function.py /asset-output/',
+              'pip install --platform manylinux2014_x86_64 --only-binary=:all: --upgrade -r requirements.txt -t /asset-output && cp lambda_function.py /asset-output/ && find . -maxdepth 1 -name "*.json" -exec cp {} /asset-output/ \\;',
             ],
             platform: 'linux/amd64',
           },
@@ -77,6 +77,7 @@ export class PluginLambdasStack extends cdk.NestedStack {
         memorySize: 256,
         role: pluginActionMedata.role,
         environment: pluginActionMedata.environmentVars,
+        layers: pluginActionMedata.layers,
       },
     );
 
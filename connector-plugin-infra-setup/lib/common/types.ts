@@ -20,4 +20,5 @@ export interface PluginActionMetadata {
   readonly role?: iam.IRole;
   readonly environmentVars: Record<string, string>;
   readonly useProxyIntegration?: boolean;
+  readonly layers?: lambda.ILayerVersion[];
 }
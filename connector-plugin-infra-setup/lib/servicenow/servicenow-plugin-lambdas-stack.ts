@@ -87,6 +87,7 @@ export class ServicenowPluginLambdasStack extends cdk.NestedStack {
           'secretsmanager:CreateSecret',
           'secretsmanager:DescribeSecret',
           'secretsmanager:UpdateSecret',
+          'secretsmanager:PutSecretValue',
           's3:GetObject',
           's3:ListBucket',
           'qbusiness:CreateDataSource',
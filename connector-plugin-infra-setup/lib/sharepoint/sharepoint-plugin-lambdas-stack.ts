@@ -1,10 +1,13 @@
 // Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 // SPDX-License-Identifier: MIT-0
 
+import { resolve } from 'path';
+
 import { StackProps } from 'aws-cdk-lib';
 import * as cdk from 'aws-cdk-lib';
 import { IRole } from 'aws-cdk-lib/aws-iam';
 import * as iam from 'aws-cdk-lib/aws-iam';
+import * as lambda from 'aws-cdk-lib/aws-lambda';
 import { Construct } from 'constructs';
 
 import { PluginLambdasStack } from '../common/PluginLambasStack';
@@ -20,11 +23,13 @@ export interface SharepointPluginLambdasStackProps extends StackProps {
 export class SharepointPluginLambdasStack extends cdk.NestedStack {
   readonly pluginActionLambdas: PluginAction[];
   readonly dataSourceCreateRole: IRole;
+  readonly sharepointCommonLayer: lambda.LayerVersion;
 
   constructor(scope: Construct, id: string, props: SharepointPluginLambdasStackProps) {
     super(scope, id, props);
 
     this.dataSourceCreateRole = this.createRoleForDataSourceCreation();
+    this.sharepointCommonLayer = this.createSharepointCommonLayer();
     const actions = this.getPluginActions(props);
 
     const lambdasStack = new PluginLambdasStack(this, 'SharepointLambdaStack', {
@@ -34,6 +39,25 @@ export class SharepointPluginLambdasStack extends cdk.NestedStack {
     this.pluginActionLambdas = lambdasStack.pluginActionLambdas;
   }
 
+  private createSharepointCommonLayer(): lambda.LayerVersion {
+    // Microsoft Graph session and MSAL token helpers shared by the Azure app lambdas
+    return new lambda.LayerVersion(this, 'SharepointCommonLayer', {
+      code: lambda.Code.fromAsset(resolve(__dirname, '../../../plugin/layers/sharepoint-common'), {
+        bundling: {
+          image: lambda.Runtime.PYTHON_3_10.bundlingImage,
+          command: [
+            'bash',
+            '-c',
+            'pip install --platform manylinux2014_x86_64 --only-binary=:all: --upgrade -r requirements.txt -t /asset-output/python && cp python/*.py /asset-output/python/',
+          ],
+          platform: 'linux/amd64',
+        },
+      }),
+      compatibleRuntimes: [lambda.Runtime.PYTHON_3_10],
+      description: 'Microsoft Graph session and MSAL token helpers for SharePoint plugin lambdas',
+    });
+  }
+
   private getPluginActions(props: SharepointPluginLambdasStackProps): Array<PluginActionMetadata> {
     return [
       {
@@ -81,6 +105,7 @@ export class SharepointPluginLambdasStack extends cdk.NestedStack {
         environmentVars: {
           CERTIFICATE_BUCKET_NAME: props.certificateBucket,
         },
+        layers: [this.sharepointCommonLayer],
       },
       {
         name: 'sharepoint-create-data-source',
@@ -93,6 +118,7 @@ export class SharepointPluginLambdasStack extends cdk.NestedStack {
           'secretsmanager:CreateSecret',
           'secretsmanager:DescribeSecret',
           'secretsmanager:UpdateSecret',
+          'secretsmanager:PutSecretValue',
           's3:GetObject',
           's3:ListBucket',
           'qbusiness:CreateDataSource',
@@ -1,9 +1,12 @@
 // Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 // SPDX-License-Identifier: MIT-0
 
+import { resolve } from 'path';
+
 import * as cdk from 'aws-cdk-lib';
 import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
 import * as iam from 'aws-cdk-lib/aws-iam';
+import * as lambda from 'aws-cdk-lib/aws-lambda';
 import { Construct } from 'constructs';
 
 import { PluginLambdasStack } from '../common/PluginLambasStack';
@@ -39,12 +42,20 @@ export class ZendeskPluginLambdasStack extends cdk.NestedStack {
    */
   public readonly dataSourceRole: iam.Role;
 
+  /**
+   * Layer with the helpers shared by the Zendesk OAuth Lambda functions
+   */
+  public readonly zendeskCommonLayer: lambda.LayerVersion;
+
   constructor(scope: Construct, id: string, props: ZendeskPluginLambdasStackProps) {
     super(scope, id);
 
     // Create IAM role for data source
     this.dataSourceRole = this.createDataSourceRole();
 
+    // Create the shared Zendesk helpers layer
+    this.zendeskCommonLayer = this.createZendeskCommonLayer();
+
     // Get plugin actions metadata
     const actions = this.getPluginActions(props.stateTable);
 
@@ -82,6 +93,27 @@ export class ZendeskPluginLambdasStack extends cdk.NestedStack {
     return role;
   }
 
+  /**
+   * Creates the layer with the request parsing and token exchange helpers shared by the Zendesk OAuth functions
+   */
+  private createZendeskCommonLayer(): lambda.LayerVersion {
+    return new lambda.LayerVersion(this, 'ZendeskCommonLayer', {
+      code: lambda.Code.fromAsset(resolve(__dirname, '../../../plugin/layers/zendesk-common'), {
+        bundling: {
+          image: lambda.Runtime.PYTHON_3_10.bundlingImage,
+          command: [
+            'bash',
+            '-c',
+            'pip install --platform manylinux2014_x86_64 --only-binary=:all: --upgrade -r requirements.txt -t /asset-output/python && cp python/*.py /asset-output/python/',
+          ],
+          platform: 'linux/amd64',
+        },
+      }),
+      compatibleRuntimes: [lambda.Runtime.PYTHON_3_10],
+      description: 'Request parsing and token exchange helpers for the Zendesk OAuth plugin lambdas',
+    });
+  }
+
   /**
    * Creates a role for a Lambda function
    */
@@ -136,6 +168,7 @@ export class ZendeskPluginLambdasStack extends cdk.NestedStack {
         environmentVars: {
           STATE_TABLE_NAME: stateTable.tableName,
         },
+        layers: [this.zendeskCommonLayer],
       },
       {
         name: 'zendesk-oauth-callback',
@@ -144,12 +177,21 @@ export class ZendeskPluginLambdasStack extends cdk.NestedStack {
         method: 'GET',
         description: 'Handles OAuth callback from Zendesk',
         role: this.createRole('oauth-callback'),
-        roleActions: ['dynamodb:GetItem', 'dynamodb:DeleteItem'],
-        roleResources: [stateTable.tableArn],
+        roleActions: [
+          'dynamodb:GetItem',
+          'dynamodb:DeleteItem',
+          'secretsmanager:CreateSecret',
+          'secretsmanager:PutSecretValue',
+        ],
+        roleResources: [
+          stateTable.tableArn,
+          'arn:aws:secretsmanager:*:*:secret:qbusiness-zendesk-secret-*',
+        ],
         environmentVars: {
           STATE_TABLE_NAME: stateTable.tableName,
         },
         useProxyIntegration: true,
+        layers: [this.zendeskCommonLayer],
       },
       {
         name: 'zendesk-exchange-auth-code-for-token',
@@ -162,6 +204,7 @@ export class ZendeskPluginLambdasStack extends cdk.NestedStack {
           'dynamodb:GetItem',
           'dynamodb:DeleteItem',
           'secretsmanager:CreateSecret',
+          'secretsmanager:PutSecretValue',
           'secretsmanager:UpdateSecret',
           'secretsmanager:GetSecretValue',
           'secretsmanager:DescribeSecret',
@@ -173,6 +216,7 @@ export class ZendeskPluginLambdasStack extends cdk.NestedStack {
         environmentVars: {
           STATE_TABLE_NAME: stateTable.tableName,
         },
+        layers: [this.zendeskCommonLayer],
       },
       {
         name: 'zendesk-create-data-source',
@@ -186,7 +230,6 @@ export class ZendeskPluginLambdasStack extends cdk.NestedStack {
           'secretsmanager:UpdateSecret',
           'secretsmanager:GetSecretValue',
           'secretsmanager:DescribeSecret',
-          'secretsmanager:ListSecrets',
           'qbusiness:CreateDataSource',
           'qbusiness:DescribeDataSource',
           'qbusiness:DisableAclOnDataSource',
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+from functools import lru_cache
+from urllib.parse import urlencode
 
 import boto3
 import requests
@@ -110,6 +112,18 @@ def get_salesforce_credentials(secret_name):
         raise Exception(f"Failed to retrieve credentials: {str(e)}")
 
 
+@lru_cache(maxsize=32)
+def build_oauth_password_body(consumer_key, consumer_secret, username, password):
+    """Build the url-encoded OAuth 2.0 Username-Password request body once per credential set."""
+    return urlencode({
+        'grant_type': 'password',
+        'client_id': consumer_key,
+        'client_secret': consumer_secret,
+        'username': username,
+        'password': password
+    }).encode('ascii')
+
+
 def test_salesforce_oauth_authentication(credentials):
     """Test Salesforce authentication using OAuth 2.0 Username-Password flow."""
     
@@ -117,24 +131,24 @@ def test_salesforce_oauth_authentication(credentials):
         # OAuth 2.0 Username-Password flow endpoint
         token_url = "https://login.salesforce.com/services/oauth2/token"
         
-        # Prepare the OAuth request data
-        data = {
-            'grant_type': 'password',
-            'client_id': credentials['consumerKey'],
-            'client_secret': credentials['consumerSecret'],
-            'username': credentials['username'],
-            'password': f"{credentials['password']}{credentials['securityToken']}"
-        }
+        # Prepare the pre-encoded OAuth request body
+        body = build_oauth_password_body(
+            credentials['consumerKey'],
+            credentials['consumerSecret'],
+            credentials['username'],
+            f"{credentials['password']}{credentials['securityToken']}"
+        )
         
         headers = {
             'Content-Type': 'application/x-www-form-urlencoded',
+            'Content-Length': str(len(body)),
             'Accept': 'application/json'
         }
         
         print(f"Testing OAuth authentication with Consumer Key: {credentials['consumerKey'][:10]}...")
         
         # Make the OAuth token request
-        response = requests.post(token_url, data=data, headers=headers, timeout=30)
+        response = requests.post(token_url, data=body, headers=headers, timeout=30)
         
         print(f"OAuth response status: {response.status_code}")
         print(f"OAuth response: {response.text}")
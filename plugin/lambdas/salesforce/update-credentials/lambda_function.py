@@ -2,12 +2,41 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+import time
+from collections import OrderedDict
 
 import boto3
 
 # Initialize AWS clients
 secretsmanager = boto3.client("secretsmanager")
 
+# Short-lived cache of parsed secret payloads, keyed by SecretId, so that
+# back-to-back updates in a warm container skip the read round trip
+SECRET_CACHE_TTL_SECONDS = 5
+SECRET_CACHE_MAX_ENTRIES = 32
+_SECRET_CACHE: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
+
+
+def _get_cached_secret(secret_name):
+    """Return a copy of the cached secret payload if still fresh, otherwise None."""
+    entry = _SECRET_CACHE.get(secret_name)
+    if entry is None:
+        return None
+    credentials, expires_at = entry
+    if time.monotonic() >= expires_at:
+        del _SECRET_CACHE[secret_name]
+        return None
+    _SECRET_CACHE.move_to_end(secret_name)
+    return dict(credentials)
+
+
+def _put_cached_secret(secret_name, credentials):
+    """Store a secret payload in the cache, evicting the least recently used entry when full."""
+    _SECRET_CACHE[secret_name] = (dict(credentials), time.monotonic() + SECRET_CACHE_TTL_SECONDS)
+    _SECRET_CACHE.move_to_end(secret_name)
+    while len(_SECRET_CACHE) > SECRET_CACHE_MAX_ENTRIES:
+        _SECRET_CACHE.popitem(last=False)
+
 
 def handler(event, context):
     """Function handler for updating Salesforce credentials with Consumer Key and Secret."""
@@ -78,9 +107,11 @@ def update_salesforce_credentials(secret_name, consumer_key, consumer_secret):
     """Update existing Salesforce credentials with Consumer Key and Secret."""
     
     try:
-        # First, retrieve the existing secret
-        response = secretsmanager.get_secret_value(SecretId=secret_name)
-        existing_credentials = json.loads(response['SecretString'])
+        # First, retrieve the existing secret (from the local cache when fresh)
+        existing_credentials = _get_cached_secret(secret_name)
+        if existing_credentials is None:
+            response = secretsmanager.get_secret_value(SecretId=secret_name)
+            existing_credentials = json.loads(response['SecretString'])
         
         # Update the credentials with Consumer Key and Secret
         existing_credentials.update({
@@ -94,6 +125,7 @@ def update_salesforce_credentials(secret_name, consumer_key, consumer_secret):
             SecretString=json.dumps(existing_credentials),
             Description="Salesforce credentials for Amazon Q Business connector"
         )
+        _put_cached_secret(secret_name, existing_credentials)
         
         print(f"Successfully updated credentials in secret: {secret_name}")
         return {
@@ -102,6 +134,7 @@ def update_salesforce_credentials(secret_name, consumer_key, consumer_secret):
         }
         
     except secretsmanager.exceptions.ResourceNotFoundException:
+        _SECRET_CACHE.pop(secret_name, None)
         return {
             "success": False,
             "error": "Secret not found",
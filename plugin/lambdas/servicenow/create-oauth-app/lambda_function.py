@@ -2,42 +2,65 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
-import uuid
+import logging
+import os
+import re
+from functools import lru_cache
 
 import requests
-from pysnc import ServiceNowClient
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# ServiceNow instance names form the first label of <instance>.service-now.com
+_INSTANCE_RE = re.compile(r"\A[a-z0-9][a-z0-9-]{1,62}\Z", re.IGNORECASE)
 
-def handler(event, context):
-    """Function handler."""
 
+def handler(event, context):
+    """Function handler for creating a ServiceNow OAuth application."""
     try:
-        print(f"received event: {event}")
+        logger.debug("received event: %s", event)
         return insert(event)
     except requests.exceptions.RequestException as e:
-        print(e)
+        logger.error("ServiceNow API error: %s", e)
         return {"statusCode": 500, "body": json.dumps({"error": "ServiceNow API Error", "message": str(e)})}
     except Exception as e:
-        print(e)
+        logger.error("Internal error: %s", e)
         return {"statusCode": 500, "body": json.dumps({"error": "Internal Server Error", "message": str(e)})}
 
 
-def insert(event):
-    """Function insert."""
+@lru_cache(maxsize=8)
+def get_servicenow_client(instance, username, password):
+    """Return a ServiceNow client per instance and credentials, reused across warm invocations."""
+    # Imported lazily so malformed requests fail without loading pysnc
+    from pysnc import ServiceNowClient
+
+    return ServiceNowClient(f"https://{instance}.service-now.com", (username, password))
 
+
+def insert(event):
+    """Insert a new OAuth application record into the ServiceNow oauth_entity table."""
     appname = event["body-json"]["name"]
     username = event["body-json"]["username"]
     password = event["body-json"]["password"]
     instance = event["body-json"]["instance"]
     redirect_url = event["body-json"]["redirectUrl"]
 
-    client = ServiceNowClient(f"https://{instance}.service-now.com", (username, password))
+    if not isinstance(instance, str) or not _INSTANCE_RE.match(instance):
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": "Bad Request", "message": f"Invalid ServiceNow instance name: {instance!r}"}),
+        }
+
+    client = get_servicenow_client(instance, username, password)
     gr = client.GlideRecord("oauth_entity")
     gr.initialize()
 
-    client_secret = str(uuid.uuid4())
-    client_id = str(uuid.uuid4())
-    app_name = f"{appname}-{str(uuid.uuid4())}"
+    # One read of 48 random bytes yields the secret, client id and name suffix
+    random_bytes = os.urandom(48)
+    client_secret = random_bytes[:16].hex()
+    client_id = random_bytes[16:32].hex()
+    app_name = f"{appname}-{random_bytes[32:].hex()}"
     gr.name = app_name
     gr.client_id = client_id
     gr.client_secret = client_secret
@@ -49,7 +72,7 @@ def insert(event):
     sysID = gr.insert()
 
     response = {"app_name": app_name, "client_id": gr.client_id, "client_secret": client_secret, "sys_id": sysID}
-    print(f"Response: {response}")
+    logger.debug("Response: %s", response)
 
     return {"statusCode": 200, "body": "ServiceNow OAuth App is successfully created", "response": response}
 
@@ -1,29 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-import html
 import json
+import logging
+import os
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
-def handler(event, context):
-    """Function handler."""
+# Single-pass equivalent of html.escape(value, quote=True)
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
 
-    print(f"event {context}")
-    # Safely extract and sanitize user input
-    question_from_user = ""
-    try:
-        if event.get("params", {}).get("querystring", {}).get("question"):
-            question_from_user = event["params"]["querystring"]["question"]
-            # Escape HTML special characters to prevent XSS
-            question_from_user = html.escape(question_from_user)
-    except Exception as e:
-        print(f"Error extracting question: {str(e)}")
-        question_from_user = "[Error: Unable to process question]"
-
-    print(f"Sanitized question: {question_from_user}")
-
-    # Create the help response template without user input
-    help_response_template = """
+# Help response template without user input, built once per container
+_HELP_RESPONSE_TEMPLATE = """
     I am a QServicenow Helper, a bot that can help setup and manage Q Business - ServiceNow Integration. Use the context below to answer user's questions
     <Context>
         I am a QServicenow Helper, a bot that can help setup and manage Q Business - ServiceNow Integration. 
@@ -44,14 +33,39 @@ def handler(event, context):
     Question: {0}
     """
 
-    # Insert the sanitized question into the template
-    help_response = help_response_template.replace("{0}", question_from_user)
+# JSON-encoded response body split around the question placeholder, so only the
+# question itself has to be encoded per invocation
+_BODY_PREFIX, _BODY_SUFFIX = json.dumps({"message": _HELP_RESPONSE_TEMPLATE}).split("{0}")
+
+
+# Fixed response headers, shared by every invocation
+_RESPONSE_HEADERS = {
+    "Content-Type": "application/json",
+    "X-Content-Type-Options": "nosniff",
+    "X-XSS-Protection": "1; mode=block",
+}
+
+
+def handler(event, context):
+    """Function handler for answering ServiceNow setup questions."""
+    logger.debug("received event %s", event)
+    # Safely extract and sanitize user input
+    question_from_user = ""
+    try:
+        if event.get("params", {}).get("querystring", {}).get("question"):
+            question_from_user = event["params"]["querystring"]["question"]
+            # Escape HTML special characters to prevent XSS
+            question_from_user = question_from_user.translate(_HTML_ESCAPE_TABLE)
+    except Exception as e:
+        logger.error("Error extracting question: %s", e)
+        question_from_user = "[Error: Unable to process question]"
+
+    logger.debug("Sanitized question: %s", question_from_user)
+
+    # Insert the sanitized question into the pre-encoded template
+    body = _BODY_PREFIX + json.dumps(question_from_user)[1:-1] + _BODY_SUFFIX
     return {
         "statusCode": 200,
-        "body": json.dumps({"message": f"{help_response}"}),
-        "headers": {
-            "Content-Type": "application/json",
-            "X-Content-Type-Options": "nosniff",
-            "X-XSS-Protection": "1; mode=block",
-        },
+        "body": body,
+        "headers": _RESPONSE_HEADERS,
     }
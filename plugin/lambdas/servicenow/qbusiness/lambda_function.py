@@ -2,54 +2,90 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
+from botocore.config import Config
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
-def handler(event, context):
-    """Function handler."""
+# Upper bound on concurrent Q Business list calls, matched by the client connection pool
+MAX_WORKERS = 16
+
+# Keys returned for each data source, paired with the Q Business summary field they are read from
+_DATA_SOURCE_FIELDS = (
+    ("dataSourceName", "displayName"),
+    ("dataSourceId", "dataSourceId"),
+    ("dataSourceType", "type"),
+    ("dataSourceStatus", "status"),
+)
+
+# Pool sized for the list workers, with adaptive retries to absorb Q Business throttling
+BOTO_CONFIG = Config(
+    max_pool_connections=MAX_WORKERS * 2,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+# Initialize AWS clients
+qbusiness = boto3.client("qbusiness", config=BOTO_CONFIG)
+
+
+def list_index_ids(application_id):
+    """List the index ids of a Q Business application."""
+    index_response = qbusiness.list_indices(applicationId=application_id)
+    return [index["indexId"] for index in index_response["indices"]]
+
+
+def list_index_data_sources(application_id, index_id):
+    """List every data source of a Q Business index, following pagination."""
+    data_source_result = (
+        qbusiness.get_paginator("list_data_sources")
+        .paginate(applicationId=application_id, indexId=index_id)
+        .build_full_result()
+    )
+    data_sources = [
+        {key: data_source.get(field) for key, field in _DATA_SOURCE_FIELDS}
+        for data_source in data_source_result.get("dataSources", [])
+    ]
 
-    qbusiness = boto3.client("qbusiness")
+    return {"indexId": index_id, "dataSources": data_sources}
+
+
+def handler(event, context):
+    """Function handler for listing Q Business applications with their indices and data sources."""
     try:
-        print(f"received event: {event}")
-        applications = []
+        logger.debug("received event: %s", event)
         application_paginator = qbusiness.get_paginator("list_applications")
-        data_sources_paginator = qbusiness.get_paginator("list_data_sources")
+        apps = [app for page in application_paginator.paginate() for app in page["applications"]]
 
-        for page in application_paginator.paginate():
-            for app in page["applications"]:
-                print(f'applicationId: {app.get("applicationId")}')
-                print(f'applicationName: {app.get("displayName")}')
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # Fetch the indices of every application concurrently
+            app_ids = [app.get("applicationId") for app in apps]
+            index_ids_per_app = list(executor.map(list_index_ids, app_ids))
 
-                result = {
+            # Then page through the data sources of every index concurrently
+            index_keys = [
+                (app_id, index_id) for app_id, index_ids in zip(app_ids, index_ids_per_app) for index_id in index_ids
+            ]
+            index_infos = list(executor.map(lambda key: list_index_data_sources(*key), index_keys))
+
+        index_infos = iter(index_infos)
+
+        applications = []
+        for app, index_ids in zip(apps, index_ids_per_app):
+            applications.append(
+                {
                     "qbusinessApplicationId": app.get("applicationId"),
                     "qbusinessApplicationName": app.get("displayName"),
+                    "indices": [next(index_infos) for _ in index_ids],
                 }
+            )
 
-                index_response = qbusiness.list_indices(applicationId=app.get("applicationId"))
-                indices = []
-
-                for index in index_response["indices"]:
-                    data_sources = []
-                    for data_source_page in data_sources_paginator.paginate(
-                        applicationId=app.get("applicationId"), indexId=index["indexId"]
-                    ):
-                        for data_source in data_source_page.get("dataSources", []):
-                            data_source_info = {
-                                "dataSourceName": data_source.get("displayName"),
-                                "dataSourceId": data_source.get("dataSourceId"),
-                                "dataSourceType": data_source.get("type"),
-                                "dataSourceStatus": data_source.get("status"),
-                            }
-                            data_sources.append(data_source_info)
-
-                    index_info = {"indexId": index["indexId"], "dataSources": data_sources}
-                    indices.append(index_info)
-
-                result["indices"] = indices
-                applications.append(result)
-
-        print(f"Found {len(applications)} applications")
+        logger.info("Found %d applications", len(applications))
         return {
             "statusCode": 200,
             "body": json.dumps(
@@ -60,7 +96,7 @@ def handler(event, context):
         }
 
     except Exception as e:
-        print(f"Error: {e}")
+        logger.error("Error: %s", e)
         return {"statusCode": 500, "body": json.dumps({"error": "Internal Server Error", "message": str(e)})}
 
 
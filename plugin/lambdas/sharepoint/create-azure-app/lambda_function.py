@@ -2,16 +2,78 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from azure.identity import ClientSecretCredential
 from msgraph.core import GraphClient
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Service principal and app role ids resolved per tenant, reused across warm invocations
+_SP_CACHE = {}
+
+
+def _application_roles(service_principal):
+    """Map application permission names to role ids, keeping the first role listed for each name."""
+    roles = {}
+    for role in service_principal.get("appRoles", []):
+        if "Application" in role.get("allowedMemberTypes", []):
+            roles.setdefault(role["value"], role["id"])
+    return roles
+
+
+def get_service_principal_ids(graph_client, tenant_id):
+    """Resolve the Microsoft Graph and SharePoint Online service principals and permission ids for a tenant."""
+    if tenant_id in _SP_CACHE:
+        return _SP_CACHE[tenant_id]
+
+    # Look up the Microsoft Graph and SharePoint Online service principals concurrently,
+    # the two queries are independent
+    filter_query = "displayName eq 'Microsoft Graph'"
+    sharepoint_filter = "displayName eq 'Office 365 SharePoint Online'"
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        response, sharepoint_response = executor.map(
+            graph_client.get,
+            [f"/servicePrincipals?$filter={filter_query}", f"/servicePrincipals?$filter={sharepoint_filter}"],
+        )
+
+    graph_service_principal = response.json()["value"][0]
+    graph_sp_id = graph_service_principal["id"]
+
+    sharepoint_sp = sharepoint_response.json()["value"][0]
+    sharepoint_sp_id = sharepoint_sp["id"]
+    sharepoint_app_id = sharepoint_sp["appId"]  # SharePoint Online App ID
+
+    # Index the application permissions of each service principal by name in a single pass
+    graph_roles = _application_roles(graph_service_principal)
+    sharepoint_roles = _application_roles(sharepoint_sp)
+    sites_full_control_id = graph_roles.get("Sites.FullControl.All")
+    application_full_control_id = graph_roles.get("Application.ReadWrite.All")
+    sharepoint_sites_full_control_id = sharepoint_roles.get("Sites.FullControl.All")
+
+    logger.debug("SharePoint APP ID: %s", sharepoint_app_id)
+    logger.debug("Graph APP ID: %s", graph_sp_id)
+
+    if not sites_full_control_id:
+        raise Exception("Could not find Sites.FullControl permission in Microsoft Graph")
+
+    _SP_CACHE[tenant_id] = {
+        "graph_sp_id": graph_sp_id,
+        "sharepoint_sp_id": sharepoint_sp_id,
+        "sharepoint_app_id": sharepoint_app_id,
+        "sites_full_control_id": sites_full_control_id,
+        "application_full_control_id": application_full_control_id,
+        "sharepoint_sites_full_control_id": sharepoint_sites_full_control_id,
+    }
+    return _SP_CACHE[tenant_id]
+
 
 def create_azure_app_with_sites_permission(
     admin_client_id, admin_client_secret, tenant_id, new_app_name, redirect_uris=None
 ):
-    """Function create_azure_app_with_sites_permission."""
-
     """
     Create a new Azure AD application with Sites.FullControl permission using admin credentials.
 
@@ -33,45 +95,11 @@ def create_azure_app_with_sites_permission(
     # Create a Graph client
     graph_client = GraphClient(credential=credential)
 
-    # First, get the Service Principal for Microsoft Graph to find the correct permission ID
-    filter_query = "displayName eq 'Microsoft Graph'"
-    response = graph_client.get(f"/servicePrincipals?$filter={filter_query}")
-    graph_service_principal = response.json()["value"][0]
-    graph_sp_id = graph_service_principal["id"]
-
-    sharepoint_filter = "displayName eq 'Office 365 SharePoint Online'"
-    sharepoint_response = graph_client.get(f"/servicePrincipals?$filter={sharepoint_filter}")
-    sharepoint_sp = sharepoint_response.json()["value"][0]
-    sharepoint_sp_id = sharepoint_sp["id"]
-    sharepoint_app_id = sharepoint_sp["appId"]  # SharePoint Online App ID
-
-    # Find the Sites.FullControl application permission
-    sites_full_control_id = None
-    application_full_control_id = None
-    sharepoint_sites_full_control_id = None
-    app_roles = graph_service_principal.get("appRoles", [])
-
-    for role in app_roles:
-        if role["value"] == "Sites.FullControl.All" and "Application" in role["allowedMemberTypes"]:
-            sites_full_control_id = role["id"]
-            break
-
-    for role in app_roles:
-        if role["value"] == "Application.ReadWrite.All" and "Application" in role["allowedMemberTypes"]:
-            application_full_control_id = role["id"]
-            break
-
-    for role in sharepoint_sp.get("appRoles", []):
-        print(f"SharePoint role: {role['value']}")
-        if role["value"] == "Sites.FullControl.All" and "Application" in role["allowedMemberTypes"]:
-            sharepoint_sites_full_control_id = role["id"]
-            break
-
-    print(f"SharePoint APP ID: {sharepoint_app_id}")
-    print(f"Graph APP ID: {graph_sp_id}")
-
-    if not sites_full_control_id:
-        raise Exception("Could not find Sites.FullControl permission in Microsoft Graph")
+    service_principal_ids = get_service_principal_ids(graph_client, tenant_id)
+    sites_full_control_id = service_principal_ids["sites_full_control_id"]
+    application_full_control_id = service_principal_ids["application_full_control_id"]
+    sharepoint_app_id = service_principal_ids["sharepoint_app_id"]
+    sharepoint_sites_full_control_id = service_principal_ids["sharepoint_sites_full_control_id"]
 
     # Prepare the application details with required resource access
     app_data = {
@@ -99,17 +127,19 @@ def create_azure_app_with_sites_permission(
 
     # Create the application
     response = graph_client.post(
-        "/applications", data=json.dumps(app_data), headers={"Content-Type": "application/json"}
+        "/applications", data=json.dumps(app_data, separators=(",", ":")), headers={"Content-Type": "application/json"}
     )
 
     app_info = response.json()
-    print(f"Application created: {app_info}")
+    logger.info("Application created: %s", app_info.get("appId"))
 
     # Create a service principal for the application
     service_principal_data = {"appId": app_info["appId"]}
 
     sp_response = graph_client.post(
-        "/servicePrincipals", data=json.dumps(service_principal_data), headers={"Content-Type": "application/json"}
+        "/servicePrincipals",
+        data=json.dumps(service_principal_data, separators=(",", ":")),
+        headers={"Content-Type": "application/json"},
     )
 
     sp_info = sp_response.json()
@@ -124,7 +154,7 @@ def create_azure_app_with_sites_permission(
 
     secret_response = graph_client.post(
         f'/applications/{app_info["id"]}/addPassword',
-        data=json.dumps(password_credential_data),
+        data=json.dumps(password_credential_data, separators=(",", ":")),
         headers={"Content-Type": "application/json"},
     )
 
@@ -144,12 +174,9 @@ def create_azure_app_with_sites_permission(
 
 
 def createApp(tenantId: str, adminAppId: str, adminSecret: str, clientAppName: str):
-    """Function createApp."""
-
-    print("Creating Azure application...")
-    print(f"Tenant ID: {tenantId}")
-    print(f"Admin App ID: {adminAppId}")
-    print(f"Client AppName: {clientAppName}")
+    """Create the Azure AD application for the SharePoint connector."""
+    logger.info("Creating Azure application %s in tenant %s", clientAppName, tenantId)
+    logger.debug("Admin App ID: %s", adminAppId)
     return create_azure_app_with_sites_permission(adminAppId, adminSecret, tenantId, clientAppName)
 
 
@@ -158,9 +185,8 @@ def construct_url_for_azure_app(appId: str) -> str:
 
 
 def handler(event, context):
-    """Function handler."""
-
-    print(f"Received event: {event}")
+    """Function handler for creating the Azure AD application used by the SharePoint connector."""
+    logger.debug("Received event: %s", event)
     app_creation_result = createApp(
         event["body-json"]["tenantId"],
         event["body-json"]["adminAppId"],
@@ -3,22 +3,77 @@
 
 import datetime
 import json
+import logging
 import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import boto3
+from botocore.config import Config
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.x509.oid import NameOID
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Client tuning: adaptive retries and keepalive on pooled connections
+BOTO_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+# Initialize AWS clients
+s3 = boto3.client("s3", config=BOTO_CONFIG)
+
+# Worker threads reused across invocations for key generation and the S3 uploads
+_POOL = ThreadPoolExecutor(max_workers=3)
+
+
+def _generate_private_key():
+    """Generate the RSA private key used to sign the certificate."""
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+
+
+# Spare key generated ahead of the next invocation, starting during container init. Each key is
+# handed out once; the handler clears this before using it and queues a replacement afterwards.
+_next_private_key = _POOL.submit(_generate_private_key)
+
+
+@lru_cache(maxsize=64)
+def _build_name(common_name, country_name, state_name, locality_name, organization_name):
+    """Build the certificate subject/issuer name, reused across invocations with the same identity."""
+    return x509.Name(
+        [
+            x509.NameAttribute(NameOID.COMMON_NAME, common_name),
+            x509.NameAttribute(NameOID.COUNTRY_NAME, country_name),
+            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, state_name),
+            x509.NameAttribute(NameOID.LOCALITY_NAME, locality_name),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, organization_name),
+        ]
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_subject_alternative_name(common_name):
+    """Build the SubjectAlternativeName extension for the certificate's common name."""
+    return x509.SubjectAlternativeName([x509.DNSName(common_name)])
+
 
 def handler(event, context):
-    """Function handler."""
+    """Function handler for generating the SharePoint certificate and storing it in S3."""
+    global _next_private_key
+
+    # Take the spare key, or start generating one now; OpenSSL releases the GIL, so the rest of the
+    # setup overlaps with any generation still in progress
+    private_key_future = _next_private_key or _POOL.submit(_generate_private_key)
+    _next_private_key = None
 
-    print(f"Received event: {event}")
-    print("Generating certificate")
+    logger.debug("Received event: %s", event)
+    logger.info("Generating certificate")
 
     # Get bucket name from environment variables
     bucket_name = os.environ["CERTIFICATE_BUCKET_NAME"]
@@ -41,47 +96,49 @@ def handler(event, context):
     organization_name = event["body-json"].get("organization_name", "Organization")
     validity_days = event.get("validity_days", 365)
 
-    # Create temporary directory for files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cert_file_path = os.path.join(temp_dir, "certificate.crt")
-        key_file_path = os.path.join(temp_dir, "private_key.pem")
-
-        # Generate private key and certificate
-        private_key, certificate = generate_self_signed_cert(
-            cert_common_name, country_name, state_name, locality_name, organization_name, validity_days
-        )
-
-        # Write certificate to file
-        with open(cert_file_path, "wb") as cert_file:
-            cert_file.write(certificate.public_bytes(encoding=serialization.Encoding.PEM))
-
-        # Get private key bytes in PEM format
-        private_key_bytes = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.TraditionalOpenSSL,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
-
-        # Write private key to file
-        with open(key_file_path, "wb") as key_file:
-            key_file.write(private_key_bytes)
+    # Generate private key and certificate
+    private_key, certificate = generate_self_signed_cert(
+        cert_common_name,
+        country_name,
+        state_name,
+        locality_name,
+        organization_name,
+        validity_days,
+        private_key_future.result(),
+    )
 
-        print("Certificate and key generated. Uploading files to S3...")
+    # Generate the spare key for the next warm invocation while the uploads are in flight
+    _next_private_key = _POOL.submit(_generate_private_key)
 
-        # Upload files to S3 with server-side encryption
-        s3_client = boto3.client("s3")
+    # Get certificate and private key bytes in PEM format
+    certificate_bytes = certificate.public_bytes(encoding=serialization.Encoding.PEM)
+    private_key_bytes = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
 
-        # Upload certificate with server-side encryption
-        s3_client.upload_file(
-            cert_file_path, bucket_name, certificate_path, ExtraArgs={"ServerSideEncryption": "AES256"}
-        )
-        print(f"Certificate uploaded to s3://{bucket_name}/{certificate_path}")
+    logger.info("Certificate and key generated. Uploading files to S3...")
 
-        # Upload private key with server-side encryption
-        s3_client.upload_file(
-            key_file_path, bucket_name, private_key_path, ExtraArgs={"ServerSideEncryption": "AES256"}
-        )
-        print(f"Private key uploaded to s3://{bucket_name}/{private_key_path}")
+    # Upload the certificate and private key concurrently with server-side encryption, straight from memory
+    certificate_upload = _POOL.submit(
+        s3.put_object,
+        Bucket=bucket_name,
+        Key=certificate_path,
+        Body=certificate_bytes,
+        ServerSideEncryption="AES256",
+    )
+    private_key_upload = _POOL.submit(
+        s3.put_object,
+        Bucket=bucket_name,
+        Key=private_key_path,
+        Body=private_key_bytes,
+        ServerSideEncryption="AES256",
+    )
+    certificate_upload.result()
+    logger.info("Certificate uploaded to s3://%s/%s", bucket_name, certificate_path)
+    private_key_upload.result()
+    logger.info("Private key uploaded to s3://%s/%s", bucket_name, private_key_path)
 
     return {
         "statusCode": 200,
@@ -103,25 +160,16 @@ def handler(event, context):
     }
 
 
-def generate_self_signed_cert(common_name, country_name, state_name, locality_name, organization_name, validity_days):
-    """Function generate_self_signed_cert."""
-
-    """
-    Generate a self-signed certificate and private key
-    """
-    # Generate private key
-    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+def generate_self_signed_cert(
+    common_name, country_name, state_name, locality_name, organization_name, validity_days, private_key=None
+):
+    """Generate a self-signed certificate and private key."""
+    # Generate private key unless one was generated ahead of time
+    if private_key is None:
+        private_key = _generate_private_key()
 
     # Build subject and issuer names
-    subject = issuer = x509.Name(
-        [
-            x509.NameAttribute(NameOID.COMMON_NAME, common_name),
-            x509.NameAttribute(NameOID.COUNTRY_NAME, country_name),
-            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, state_name),
-            x509.NameAttribute(NameOID.LOCALITY_NAME, locality_name),
-            x509.NameAttribute(NameOID.ORGANIZATION_NAME, organization_name),
-        ]
-    )
+    subject = issuer = _build_name(common_name, country_name, state_name, locality_name, organization_name)
 
     # Certificate validity period
     now = datetime.datetime.utcnow()
@@ -134,7 +182,7 @@ def generate_self_signed_cert(common_name, country_name, state_name, locality_na
         .not_valid_before(now)
         .not_valid_after(now + datetime.timedelta(days=validity_days))
         .add_extension(
-            x509.SubjectAlternativeName([x509.DNSName(common_name)]),
+            _build_subject_alternative_name(common_name),
             critical=False,
         )
         .sign(private_key, hashes.SHA256(), default_backend())
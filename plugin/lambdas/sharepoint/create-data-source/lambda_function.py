@@ -1,38 +1,77 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-import json
+import logging
 import os
+import time
+from collections import OrderedDict
+from pathlib import Path
 
 import boto3
-from botocore.exceptions import ClientError
+import orjson
+from botocore.config import Config
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
-def read_private_key(bucket, client_id, file_name="private.key"):
-    """Function read_private_key."""
+# Shared by all clients below: adaptive retries and keepalive on pooled connections
+BOTO_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+# Initialize AWS clients
+s3 = boto3.client("s3", config=BOTO_CONFIG)
+qbusiness = boto3.client("qbusiness", config=BOTO_CONFIG)
+secretsmanager = boto3.client(
+    "secretsmanager", region_name=os.environ.get("AWS_REGION", "us-east-1"), config=BOTO_CONFIG
+)
+
+# Static SharePoint data source configuration, read once per container. Each call
+# decodes a fresh copy and fills in the site, tenant, certificate and secret fields.
+_SHAREPOINT_CONFIG_TEMPLATE = Path(__file__).with_name("sharepoint_config.json").read_bytes()
 
+# Private keys read from S3, kept briefly so a regenerated certificate is picked up quickly
+PRIVATE_KEY_CACHE_TTL_SECONDS = 30
+PRIVATE_KEY_CACHE_MAX_ENTRIES = 32
+_PRIVATE_KEY_CACHE: "OrderedDict[tuple[str, str], tuple[str, float]]" = OrderedDict()
+
+
+def read_private_key(bucket, client_id, file_name="private.key"):
     """
     Read private key from S3 with server-side encryption
-    
+
     Args:
         bucket (str): S3 bucket name
         client_id (str): Azure client ID used as subfolder
         file_name (str): File name within the client ID subfolder
-        
+
     Returns:
         str: Private key content
     """
-    s3_client = boto3.client("s3")
-
     # Construct the full path with client ID subfolder
     file_path = f"{client_id}/{file_name}"
-    print(f"Reading private key from {bucket}/{file_path}")
+
+    # Serve a recently read key without another S3 round trip
+    cache_key = (bucket, file_path)
+    entry = _PRIVATE_KEY_CACHE.get(cache_key)
+    if entry is not None and time.monotonic() < entry[1]:
+        _PRIVATE_KEY_CACHE.move_to_end(cache_key)
+        return entry[0]
+
+    logger.info("Reading private key from %s/%s", bucket, file_path)
 
     # Get the object with server-side encryption
-    response = s3_client.get_object(Bucket=bucket, Key=file_path)
+    response = s3.get_object(Bucket=bucket, Key=file_path)
 
     # Read and decode the private key
     private_key_content = response["Body"].read().decode("utf-8")
+
+    _PRIVATE_KEY_CACHE[cache_key] = (private_key_content, time.monotonic() + PRIVATE_KEY_CACHE_TTL_SECONDS)
+    _PRIVATE_KEY_CACHE.move_to_end(cache_key)
+    while len(_PRIVATE_KEY_CACHE) > PRIVATE_KEY_CACHE_MAX_ENTRIES:
+        _PRIVATE_KEY_CACHE.popitem(last=False)
     return private_key_content
 
 
@@ -42,41 +81,27 @@ def store_credentials_in_secrets_manager(
     private_key,
     auth_type,
     description="API credentials",
-    region_name="us-east-1",
 ):
-    """Function store_credentials_in_secrets_manager."""
-
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(service_name="secretsmanager", region_name=region_name)
-
-    # Create the secret value as a JSON string
-    secret_value = json.dumps({"clientId": client_id, "privateKey": private_key, "authType": auth_type})
+    """Store the SharePoint certificate credentials in AWS Secrets Manager."""
+    # Create the secret value as a JSON string (SecretString expects str)
+    secret_value = orjson.dumps({"clientId": client_id, "privateKey": private_key, "authType": auth_type}).decode()
     # Don't log sensitive information
-    print("Preparing to store credentials in Secrets Manager")
+    logger.info("Preparing to store credentials in Secrets Manager")
     try:
-        # Create the secret in AWS Secrets Manager
-        response = client.create_secret(Name=secret_name, Description=description, SecretString=secret_value)
-        print(f"Secret {secret_name} successfully created/updated")
+        # Write a new version of the existing secret in a single round trip
+        response = secretsmanager.put_secret_value(SecretId=secret_name, SecretString=secret_value)
+        logger.info("Secret %s already existed and was updated", secret_name)
+        return response
+    except secretsmanager.exceptions.ResourceNotFoundException:
+        # First run for this domain and client, create the secret
+        response = secretsmanager.create_secret(Name=secret_name, Description=description, SecretString=secret_value)
+        logger.info("Secret %s successfully created", secret_name)
         return response
-    except ClientError as e:
-        # Handle specific errors
-        if e.response["Error"]["Code"] == "ResourceExistsException":
-            # Secret already exists, update it
-            response = client.update_secret(SecretId=secret_name, SecretString=secret_value)
-            print(f"Secret {secret_name} already existed and was updated")
-            return response
-        else:
-            # Handle other exceptions
-            print(f"Error: {e}")
-            raise
 
 
 def create_data_source(application_id, index_id, configuration, data_source_name, role_arn):
-    """Function create_data_source."""
-
-    q = boto3.client("qbusiness")
-    response = q.create_data_source(
+    """Create the SharePoint data source in the Q Business index."""
+    response = qbusiness.create_data_source(
         applicationId=application_id,
         indexId=index_id,
         displayName=data_source_name,
@@ -85,179 +110,28 @@ def create_data_source(application_id, index_id, configuration, data_source_name
         roleArn=role_arn,
     )
 
-    print(f"Data source creation response: {response}")
+    logger.debug("Data source creation response: %s", response)
     return response
 
 
 def config_for_sharepoint(secrets_arn, tenant_id, sharepoint_url, s3_bucket, client_id):
-    """Function config_for_sharepoint."""
-
+    """Build the SharePoint data source configuration from the static template."""
     # Use client ID subfolder for certificate path
     cert_file_name = f"{client_id}/sharepoint.crt"
 
-    return {
-        "connectionConfiguration": {
-            "repositoryEndpointMetadata": {
-                "domain": "awsplatodemo",
-                "siteUrls": [
-                    f"{sharepoint_url}",
-                ],
-                "repositoryAdditionalProperties": {
-                    "version": "Online",
-                    "onPremVersion": "",
-                    "authType": "OAuth2Certificate",
-                    "s3bucketName": f"{s3_bucket}",
-                    "s3certificateName": f"{cert_file_name}",
-                },
-                "tenantId": f"{tenant_id}",
-            }
-        },
-        "additionalProperties": {
-            "crawlFiles": "true",
-            "crawlPages": "true",
-            "crawlEvents": "true",
-            "crawlComments": "true",
-            "crawlLinks": "true",
-            "crawlAttachment": "true",
-            "crawlListData": "true",
-            "crawlAcl": "true",
-            "isCrawlLocalGroupMapping": "true",
-            "isCrawlAdGroupMapping": "false",
-            "eventTitleFilterRegEx": [],
-            "pageTitleFilterRegEx": [],
-            "linkTitleFilterRegEx": [],
-            "inclusionFilePath": [],
-            "exclusionFilePath": [],
-            "inclusionFileTypePatterns": [],
-            "exclusionFileTypePatterns": [],
-            "inclusionFileNamePatterns": [],
-            "exclusionFileNamePatterns": [],
-            "inclusionOneNoteSectionNamePatterns": [],
-            "exclusionOneNoteSectionNamePatterns": [],
-            "inclusionOneNotePageNamePatterns": [],
-            "exclusionOneNotePageNamePatterns": [],
-            "proxyPort": "",
-            "fieldForUserId": "uuid",
-            "includeSupportedFileType": "false",
-            "maxFileSizeInMegaBytes": "5",
-            "enableDeletionProtection": "false",
-            "deletionProtectionThreshold": "0",
-        },
-        "enableIdentityCrawler": "true",
-        "syncMode": "FORCED_FULL_CRAWL",
-        "type": "SHAREPOINT",
-        "secretArn": f"{secrets_arn}",
-        "repositoryConfigurations": {
-            "file": {
-                "fieldMappings": [
-                    {"indexFieldName": "_document_title", "indexFieldType": "STRING", "dataSourceFieldName": "title"},
-                    {
-                        "indexFieldName": "_last_updated_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "lastModifiedDateTime",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUri"},
-                    {
-                        "indexFieldName": "_created_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "createdAt",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_authors", "indexFieldType": "STRING_LIST", "dataSourceFieldName": "author"},
-                    {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
-                ]
-            },
-            "event": {
-                "fieldMappings": [
-                    {"indexFieldName": "_document_title", "indexFieldType": "STRING", "dataSourceFieldName": "title"},
-                    {
-                        "indexFieldName": "_last_updated_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "lastModifiedDateTime",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUri"},
-                    {
-                        "indexFieldName": "_created_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "createdDate",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
-                ]
-            },
-            "page": {
-                "fieldMappings": [
-                    {
-                        "indexFieldName": "_created_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "createdDateTime",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {
-                        "indexFieldName": "_last_updated_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "lastModifiedDateTime",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_document_title", "indexFieldType": "STRING", "dataSourceFieldName": "title"},
-                    {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUri"},
-                    {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
-                ]
-            },
-            "link": {
-                "fieldMappings": [
-                    {
-                        "indexFieldName": "_created_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "createdAt",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {
-                        "indexFieldName": "_last_updated_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "lastModifiedDateTime",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_document_title", "indexFieldType": "STRING", "dataSourceFieldName": "title"},
-                    {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUri"},
-                    {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
-                ]
-            },
-            "attachment": {
-                "fieldMappings": [
-                    {
-                        "indexFieldName": "_created_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "parentCreatedDate",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUri"},
-                    {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
-                ]
-            },
-            "comment": {
-                "fieldMappings": [
-                    {
-                        "indexFieldName": "_created_at",
-                        "indexFieldType": "DATE",
-                        "dataSourceFieldName": "createdDateTime",
-                        "dateFieldFormat": "yyyy-MM-dd'T'HH:mm:ss'Z'",
-                    },
-                    {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUri"},
-                    {"indexFieldName": "_authors", "indexFieldType": "STRING_LIST", "dataSourceFieldName": "author"},
-                    {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
-                ]
-            },
-        },
-    }
+    config = orjson.loads(_SHAREPOINT_CONFIG_TEMPLATE)
+    endpoint = config["connectionConfiguration"]["repositoryEndpointMetadata"]
+    endpoint["siteUrls"] = [sharepoint_url]
+    endpoint["repositoryAdditionalProperties"]["s3bucketName"] = s3_bucket
+    endpoint["repositoryAdditionalProperties"]["s3certificateName"] = cert_file_name
+    endpoint["tenantId"] = tenant_id
+    config["secretArn"] = secrets_arn
+    return config
 
 
 def handler(event, context):
-    """Function handler."""
-
-    print(f"Received event: {event}")
+    """Function handler for creating a SharePoint data source in Q Business."""
+    logger.debug("Received event: %s", event)
 
     # Extract parameters from the request body
     application_id = event["body-json"]["applicationId"]
@@ -270,7 +144,7 @@ def handler(event, context):
 
     # Read private key from S3 using client ID subfolder
     pk = read_private_key(s3_bucket, client_id)
-    print("Private key retrieved successfully")
+    logger.info("Private key retrieved successfully")
 
     # Extract domain from SharePoint URL
     from urllib.parse import urlparse
@@ -291,7 +165,7 @@ def handler(event, context):
     )
 
     data_source_id = response.get("dataSourceId")
-    print(f"Data source created with ID: {data_source_id}")
+    logger.info("Data source created with ID: %s", data_source_id)
 
     return {
         "statusCode": 200,
@@ -2,15 +2,19 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+import logging
+import os
 
-from azure.identity import ClientSecretCredential
-from msgraph.core import GraphClient
+import msal
+import requests
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
-def handler(event, context):
-    """Function handler."""
 
-    print(f"Received event: {event}")
+def handler(event, context):
+    """Function handler for deleting an Azure AD application."""
+    logger.debug("Received event: %s", event)
 
     # Get parameters from event
     tenant_id = event["body-json"]["tenantId"]
@@ -30,15 +34,24 @@ def handler(event, context):
         }
 
     try:
-        # Create a credential object
-        credential = ClientSecretCredential(tenant_id=tenant_id, client_id=client_id, client_secret=client_secret)
-
-        # Create a Graph client
-        graph_client = GraphClient(credential=credential)
+        # Get a Graph token for the admin app; this function is not deployed by the CDK stacks, so it cannot
+        # rely on the sharepoint-common layer and makes the single token call itself
+        authority = f"https://login.microsoftonline.com/{tenant_id}"
+        app = msal.ConfidentialClientApplication(
+            client_id=client_id, client_credential=client_secret, authority=authority
+        )
+        result = app.acquire_token_for_client(scopes=["https://graph.microsoft.com/.default"])
+        if "access_token" not in result:
+            raise Exception(f"Failed to acquire token: {result.get('error_description', 'Unknown error')}")
 
         # Delete the application
-        response = graph_client.delete(f"/applications/{app_id_to_delete}")
-        print(f"Successfully deleted application with ID: {app_id_to_delete}")
+        response = requests.delete(
+            f"https://graph.microsoft.com/v1.0/applications/{app_id_to_delete}",
+            headers={"Authorization": f"Bearer {result['access_token']}"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        logger.info("Successfully deleted application with ID: %s", app_id_to_delete)
 
         return {
             "statusCode": 200,
@@ -46,5 +59,5 @@ def handler(event, context):
         }
 
     except Exception as e:
-        print(f"Error deleting application: {str(e)}")
+        logger.error("Error deleting application: %s", e)
         return {"statusCode": 500, "body": json.dumps({"message": f"Error deleting application: {str(e)}"})}
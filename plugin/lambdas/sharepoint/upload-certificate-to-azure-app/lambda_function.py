@@ -3,19 +3,36 @@
 
 import base64
 import json
+import logging
 import os
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 import boto3
-import msal
+import orjson
 import requests
+from botocore.config import Config
+from sharepoint_common import graph_token, session
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Upper bound on the certificate object read from S3; PEM certificates are a few KB
+MAX_CERTIFICATE_BYTES = 64 * 1024
+
+# Initialize AWS clients
+s3 = boto3.client("s3", config=Config(max_pool_connections=25, retries={"max_attempts": 3, "mode": "standard"}))
+
+# HTTP session from the sharepoint-common layer, reused across warm invocations so keep-alive
+# connections to Microsoft Graph are not re-established on every call
+http = session()
 
 
 def handler(event, context):
-    """Function handler."""
+    """Function handler for uploading a certificate from S3 to an Azure AD application."""
 
     try:
-        print(f"Received event: {event}")
+        logger.debug("Received event: %s", event)
 
         # Get configuration from event and environment variables
         s3_bucket = event["body-json"]["s3Bucket"]
@@ -29,17 +46,20 @@ def handler(event, context):
         client_folder = f"{azure_client_id}/"
         s3_cert_key = f"{client_folder}sharepoint.crt"
 
-        # Get certificate from S3
-        cert_data = get_certificate_from_s3(s3_bucket, s3_cert_key)
-        print(f"Certificate retrieved from S3: {s3_bucket}/{s3_cert_key}")
-
-        # Get access token
-        access_token = get_access_token(azure_tenant_id, azure_client_id, azure_client_secret)
-        print("Access token acquired successfully")
+        # Get the certificate from S3 and the access token concurrently, they hit unrelated services
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            cert_future = executor.submit(get_certificate_from_s3, s3_bucket, s3_cert_key)
+            token_future = executor.submit(get_access_token, azure_tenant_id, azure_client_id, azure_client_secret)
+            cert_data = cert_future.result()
+            logger.info("Certificate retrieved from S3: %s/%s", s3_bucket, s3_cert_key)
+            access_token = token_future.result()
+            logger.info("Access token acquired successfully")
 
         # Update application with certificate
-        success = update_application_with_certificate(access_token, azure_object_id, cert_data, cert_display_name)
-        print(f"Certificate uploaded to Azure application: {azure_object_id}")
+        certificate_name = update_application_with_certificate(
+            access_token, azure_object_id, cert_data, cert_display_name
+        )
+        logger.info("Certificate uploaded to Azure application: %s", azure_object_id)
 
         return {
             "statusCode": 200,
@@ -47,7 +67,7 @@ def handler(event, context):
                 {
                     "message": "Certificate updated successfully",
                     "applicationId": azure_client_id,
-                    "certificateName": cert_display_name or f"Certificate-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
+                    "certificateName": certificate_name,
                     "certificatePath": s3_cert_key,
                 }
             ),
@@ -58,7 +78,7 @@ def handler(event, context):
         if hasattr(e, "response") and "body" in e.response:
             error_message = e.response["body"]
 
-        print(f"Certificate update process failed: {error_message}")
+        logger.error("Certificate update process failed: %s", error_message)
         return {
             "statusCode": 500,
             "body": json.dumps({"message": "Certificate update process failed", "error": error_message}),
@@ -70,13 +90,16 @@ def get_certificate_from_s3(bucket_name, cert_key):
     Download the certificate file from S3 bucket
     """
     try:
-        s3_client = boto3.client("s3")
-        response = s3_client.get_object(Bucket=bucket_name, Key=cert_key)
+        response = s3.get_object(Bucket=bucket_name, Key=cert_key, Range=f"bytes=0-{MAX_CERTIFICATE_BYTES - 1}")
+        # ContentRange is "bytes <first>-<last>/<total>"; refuse to upload a truncated certificate
+        total_size = int(response["ContentRange"].rsplit("/", 1)[1])
+        if total_size > MAX_CERTIFICATE_BYTES:
+            raise Exception(f"Certificate {cert_key} is {total_size} bytes, larger than {MAX_CERTIFICATE_BYTES}")
         cert_data = response["Body"].read()
-        print(f"Successfully retrieved certificate from S3: {bucket_name}/{cert_key}")
+        logger.info("Successfully retrieved certificate from S3: %s/%s", bucket_name, cert_key)
         return cert_data
     except Exception as e:
-        print(f"Error retrieving certificate from S3: {str(e)}")
+        logger.error("Error retrieving certificate from S3: %s", e)
         raise
 
 
@@ -85,30 +108,18 @@ def get_access_token(tenant_id, client_id, client_secret):
     Get Microsoft Graph API access token using client credentials flow
     """
     try:
-        authority = f"https://login.microsoftonline.com/{tenant_id}"
-        app = msal.ConfidentialClientApplication(
-            client_id=client_id, client_credential=client_secret, authority=authority
-        )
-
-        # The scope needed for application management
-        scopes = ["https://graph.microsoft.com/.default"]
-
-        result = app.acquire_token_for_client(scopes=scopes)
-
-        if "access_token" in result:
-            print("Successfully acquired access token")
-            return result["access_token"]
-        else:
-            print(f"Error acquiring token: {result.get('error_description', 'Unknown error')}")
-            raise Exception(f"Failed to acquire token: {result.get('error_description', 'Unknown error')}")
+        # Served from the layer's MSAL token cache while the previous token is still valid
+        access_token = graph_token(tenant_id, client_id, client_secret)
+        logger.info("Successfully acquired access token")
+        return access_token
     except Exception as e:
-        print(f"Error in authentication: {str(e)}")
+        logger.error("Error in authentication: %s", e)
         raise
 
 
 def update_application_with_certificate(access_token, application_id, cert_data, cert_display_name=None):
     """
-    Update an Azure application with a new certificate
+    Update an Azure application with a new certificate and return the certificate display name
     """
     try:
         # Base64 encode the certificate data
@@ -116,11 +127,12 @@ def update_application_with_certificate(access_token, application_id, cert_data,
 
         # Calculate expiry date (certificates typically have this info embedded,
         # but for this example we'll set it to 1 year from now)
-        start_date = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        now = datetime.now(timezone.utc)
+        start_date = now.strftime("%Y-%m-%dT%H:%M:%SZ")
         end_date = "2026-04-10"
 
         # Prepare the certificate data for the Graph API
-        display_name = cert_display_name or f"Certificate-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+        display_name = cert_display_name or f"Certificate-{now.strftime('%Y%m%d%H%M%S')}"
 
         # Prepare the request body
         key_credential = {
@@ -141,20 +153,20 @@ def update_application_with_certificate(access_token, application_id, cert_data,
         headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
 
         try:
-            response = requests.patch(graph_url, headers=headers, data=json.dumps(key_credential), timeout=30)
+            response = http.patch(graph_url, headers=headers, data=orjson.dumps(key_credential), timeout=30)
             response.raise_for_status()
-            print(f"Successfully updated application {application_id} with new certificate")
-            return True
+            logger.info("Successfully updated application %s with new certificate", application_id)
+            return display_name
         except requests.exceptions.RequestException as e:
             error_details = (
-                e.response.json()
+                orjson.loads(e.response.content)
                 if hasattr(e, "response") and e.response and e.response.text
                 else {"error": "No details available"}
             )
-            print(f"Error updating application: {str(e)} - {error_details}")
+            logger.error("Error updating application: %s - %s", e, error_details)
             raise Exception(f"Failed to update application: {str(e)} - {error_details}")
     except Exception as e:
-        print(f"Error updating application with certificate: {str(e)}")
+        logger.error("Error updating application with certificate: %s", e)
         raise
 
 
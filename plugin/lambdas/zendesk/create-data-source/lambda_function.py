@@ -2,24 +2,76 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+import logging
 import os
 
 import boto3
+from botocore.config import Config
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Short timeouts so a stalled connection is retried well within the 30s Lambda timeout
+BOTO_CONFIG = Config(
+    connect_timeout=3,
+    read_timeout=15,
+    retries={"max_attempts": 4, "mode": "adaptive"},
+    max_pool_connections=25,
+)
 
 # Initialize AWS clients
-secretsmanager = boto3.client("secretsmanager")
-qbusiness = boto3.client("qbusiness")
+secretsmanager = boto3.client("secretsmanager", config=BOTO_CONFIG)
+qbusiness = boto3.client("qbusiness", config=BOTO_CONFIG)
+
+# Common field mappings that apply to multiple content types
+_COMMON_FIELD_MAPPINGS = [
+    {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
+    {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUrl"},
+    {
+        "indexFieldName": "_created_at",
+        "indexFieldType": "DATE",
+        "dataSourceFieldName": "createdAt",
+        "dateFieldFormat": "dd-MM-yyyy HH:mm:ss",
+    },
+    {
+        "indexFieldName": "_last_updated_at",
+        "indexFieldType": "DATE",
+        "dataSourceFieldName": "updatedAt",
+        "dateFieldFormat": "dd-MM-yyyy HH:mm:ss",
+    },
+]
+
+# Author field mapping - only used in some content types
+_AUTHOR_FIELD_MAPPING = {
+    "indexFieldName": "_authors",
+    "indexFieldType": "STRING_LIST",
+    "dataSourceFieldName": "authors",
+}
+
+# Repository configurations with field mappings for each content type, built once per container
+_REPOSITORY_CONFIGURATIONS = {
+    # Ticket configuration
+    "ticket": {"fieldMappings": _COMMON_FIELD_MAPPINGS + [_AUTHOR_FIELD_MAPPING]},
+    # Ticket comment configuration
+    "ticketComment": {"fieldMappings": _COMMON_FIELD_MAPPINGS + [_AUTHOR_FIELD_MAPPING]},
+    # Article configuration (for Zendesk Guide)
+    "article": {
+        "fieldMappings": _COMMON_FIELD_MAPPINGS
+        + [_AUTHOR_FIELD_MAPPING]
+        + [{"indexFieldName": "_document_title", "indexFieldType": "STRING", "dataSourceFieldName": "title"}]
+    },
+}
 
 
 def handler(event, context):
     """Function handler."""
 
     try:
-        print(f"Received event: {json.dumps(event)}")
+        logger.debug("Received event: %s", event)
 
         # Parse the request body
         body = parse_body(event)
-        print(f"Parsed body: {json.dumps(body)}")
+        logger.debug("Parsed body: %s", body)
 
         # Get required parameters
         application_id = body.get("qbusinessApplicationId") or body.get("applicationId")
@@ -29,13 +81,19 @@ def handler(event, context):
         data_source_type = body.get("dataSourceType", "BOTH")  # Default to BOTH
         client_id = body.get("clientId")
 
-        print(
-            f"Parameters: applicationId={application_id}, indexId={index_id}, dataSourceName={data_source_name}, zendeskSubdomain={zendesk_subdomain}, dataSourceType={data_source_type}, clientId={client_id}"
+        logger.debug(
+            "Parameters: applicationId=%s, indexId=%s, dataSourceName=%s, zendeskSubdomain=%s, dataSourceType=%s, clientId=%s",
+            application_id,
+            index_id,
+            data_source_name,
+            zendesk_subdomain,
+            data_source_type,
+            client_id,
         )
 
         # Validate required parameters
         if not application_id or not index_id or not zendesk_subdomain:
-            print("Missing required parameters")
+            logger.info("Missing required parameters")
             return {
                 "statusCode": 400,
                 "body": json.dumps(
@@ -48,13 +106,16 @@ def handler(event, context):
 
         if not data_source_name:
             data_source_name = f"Zendesk-{zendesk_subdomain}"
-            print(f"Using default data source name: {data_source_name}")
+            logger.info("Using default data source name: %s", data_source_name)
 
-        # Find the secret ARN for the Zendesk OAuth token
-        secret_arn = find_secret_arn_by_subdomain(zendesk_subdomain, client_id)
+        # Use the secret ARN from the caller when it names this subdomain's OAuth token secret,
+        # otherwise look it up
+        secret_arn = body.get("secretArn")
+        if not is_zendesk_secret_arn(secret_arn, zendesk_subdomain, client_id):
+            secret_arn = find_secret_arn_by_subdomain(zendesk_subdomain, client_id)
 
         if not secret_arn:
-            print(f"No OAuth token found for {zendesk_subdomain}")
+            logger.info("No OAuth token found for %s", zendesk_subdomain)
             return {
                 "statusCode": 400,
                 "body": json.dumps(
@@ -67,10 +128,10 @@ def handler(event, context):
 
         # Get the IAM role ARN for the data source
         data_source_role_arn = os.environ.get("DATA_SOURCE_ROLE_ARN")
-        print(f"Data source role ARN: {data_source_role_arn}")
+        logger.debug("Data source role ARN: %s", data_source_role_arn)
 
         if not data_source_role_arn:
-            print("DATA_SOURCE_ROLE_ARN environment variable not set")
+            logger.error("DATA_SOURCE_ROLE_ARN environment variable not set")
             return {
                 "statusCode": 500,
                 "body": json.dumps(
@@ -89,7 +150,7 @@ def handler(event, context):
         }
 
         create_result = create_data_source(config, data_source_role_arn)
-        print(f"CreateDataSource API Response: {json.dumps(create_result)}")
+        logger.debug("CreateDataSource API Response: %s", create_result)
 
         return {
             "statusCode": 200,
@@ -105,7 +166,7 @@ def handler(event, context):
             ),
         }
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return {"statusCode": 500, "body": json.dumps({"error": "Internal Server Error", "message": str(e)})}
 
 
@@ -119,48 +180,51 @@ def parse_body(event):
             try:
                 return json.loads(event["body"])
             except json.JSONDecodeError as e:
-                print(f"Error parsing JSON body: {str(e)}")
+                logger.error("Error parsing JSON body: %s", e)
                 return {}
         return event["body"]
 
     return {}
 
 
+def zendesk_secret_name(zendesk_subdomain, client_id):
+    """Name of the secret holding the OAuth token for a Zendesk subdomain and client ID"""
+    unique_id = client_id.split("-")[-1]
+    return f"qbusiness-zendesk-secret-{zendesk_subdomain}-{unique_id}"
+
+
+def is_zendesk_secret_arn(secret_arn, zendesk_subdomain, client_id):
+    """Check that an ARN refers to the OAuth token secret for a Zendesk subdomain and client ID"""
+    if not secret_arn or not client_id or not secret_arn.startswith("arn:"):
+        return False
+    # arn:<partition>:secretsmanager:<region>:<account>:secret:<name>-<6 random characters>
+    resource = secret_arn.split(":secret:", 1)[-1]
+    return resource.rpartition("-")[0] == zendesk_secret_name(zendesk_subdomain, client_id)
+
+
 def find_secret_arn_by_subdomain(zendesk_subdomain, client_id):
     """Function find_secret_arn_by_subdomain and client ID"""
-    unique_id = client_id.split("-")[-1]
-    secret_name = f"qbusiness-zendesk-secret-{zendesk_subdomain}-{unique_id}"
+    secret_name = zendesk_secret_name(zendesk_subdomain, client_id)
 
+    # The secret name is fully determined by the subdomain and client ID, so a single lookup suffices
     try:
-        # First try with the exact name
-        try:
-            response = secretsmanager.describe_secret(SecretId=secret_name)
-            print(f"Found secret ARN for subdomain {zendesk_subdomain}: {response['ARN']}")
-            return response["ARN"]
-        except secretsmanager.exceptions.ResourceNotFoundException:
-            print(f"Secret {secret_name} not found, trying to list secrets")
-
-        # If not found, list secrets with the name filter
-        response = secretsmanager.list_secrets(Filters=[{"Key": "name", "Values": [f"zendesk-oauth-token"]}])
-
-        # Find the matching secret
-        for secret in response.get("SecretList", []):
-            if zendesk_subdomain in secret["Name"]:
-                print(f"Found matching secret: {secret['Name']} with ARN: {secret['ARN']}")
-                return secret["ARN"]
-
-        print(f"No secret found for subdomain {zendesk_subdomain}")
+        response = secretsmanager.describe_secret(SecretId=secret_name)
+        logger.info("Found secret ARN for subdomain %s: %s", zendesk_subdomain, response["ARN"])
+        return response["ARN"]
+    except secretsmanager.exceptions.ResourceNotFoundException:
+        logger.info("No secret found for subdomain %s", zendesk_subdomain)
         return None
     except Exception as e:
-        print(f"Error finding secret ARN: {str(e)}")
+        logger.error("Error finding secret ARN: %s", e)
         return None
 
 
 def generate_zendesk_configuration(secret_arn, zendesk_subdomain, data_source_type):
     """Generate the configuration for a Zendesk data source"""
     # Determine which content types to crawl based on dataSourceType
-    crawl_article = data_source_type == "GUIDE" or data_source_type == "BOTH"
-    crawl_ticket = data_source_type == "SUPPORT" or data_source_type == "BOTH"
+    # The connector expects these flags as the strings "true"/"false"
+    crawl_article = "true" if data_source_type in ("GUIDE", "BOTH") else "false"
+    crawl_ticket = "true" if data_source_type in ("SUPPORT", "BOTH") else "false"
 
     return {
         "connectionConfiguration": {
@@ -175,10 +239,10 @@ def generate_zendesk_configuration(secret_arn, zendesk_subdomain, data_source_ty
             # Date filters
             "sinceDate": None,
             # Content type flags
-            "isCrawTicket": str(crawl_ticket).lower(),
-            "isCrawTicketComment": str(crawl_ticket).lower(),
+            "isCrawTicket": crawl_ticket,
+            "isCrawTicketComment": crawl_ticket,
             "isCrawTicketCommentAttachment": "false",
-            "isCrawlArticle": str(crawl_article).lower(),
+            "isCrawlArticle": crawl_article,
             "isCrawlArticleAttachment": "false",
             "isCrawlArticleComment": "false",
             "isCrawlCommunityTopic": "false",
@@ -201,49 +265,7 @@ def generate_zendesk_configuration(secret_arn, zendesk_subdomain, data_source_ty
         "syncMode": "FORCED_FULL_CRAWL",
         "type": "ZENDESK",
         "secretArn": secret_arn,
-        "repositoryConfigurations": generate_repository_configurations(),
-    }
-
-
-def generate_repository_configurations():
-    """Generate repository configurations with field mappings for different content types"""
-    # Common field mappings that apply to multiple content types
-    common_field_mappings = [
-        {"indexFieldName": "_category", "indexFieldType": "STRING", "dataSourceFieldName": "category"},
-        {"indexFieldName": "_source_uri", "indexFieldType": "STRING", "dataSourceFieldName": "sourceUrl"},
-        {
-            "indexFieldName": "_created_at",
-            "indexFieldType": "DATE",
-            "dataSourceFieldName": "createdAt",
-            "dateFieldFormat": "dd-MM-yyyy HH:mm:ss",
-        },
-        {
-            "indexFieldName": "_last_updated_at",
-            "indexFieldType": "DATE",
-            "dataSourceFieldName": "updatedAt",
-            "dateFieldFormat": "dd-MM-yyyy HH:mm:ss",
-        },
-    ]
-
-    # Author field mapping - only used in some content types
-    author_field_mapping = {
-        "indexFieldName": "_authors",
-        "indexFieldType": "STRING_LIST",
-        "dataSourceFieldName": "authors",
-    }
-
-    # Create configurations for each content type
-    return {
-        # Ticket configuration
-        "ticket": {"fieldMappings": common_field_mappings + [author_field_mapping]},
-        # Ticket comment configuration
-        "ticketComment": {"fieldMappings": common_field_mappings + [author_field_mapping]},
-        # Article configuration (for Zendesk Guide)
-        "article": {
-            "fieldMappings": common_field_mappings
-            + [author_field_mapping]
-            + [{"indexFieldName": "_document_title", "indexFieldType": "STRING", "dataSourceFieldName": "title"}]
-        },
+        "repositoryConfigurations": _REPOSITORY_CONFIGURATIONS,
     }
 
 
@@ -266,14 +288,13 @@ def create_data_source(config, data_source_role_arn):
         "description": f"Zendesk data source for {config['zendeskSubdomain']}",
     }
 
-    # Log the configuration for debugging
-    log_config = {
-        "applicationId": config["qbusinessApplicationId"],
-        "indexId": config["qindexId"],
-        "displayName": config["dataSourceName"],
-        "zendeskSubdomain": config["zendeskSubdomain"],
-    }
-    print(f"Creating Zendesk data source with configuration: {json.dumps(log_config)}")
+    logger.info(
+        "Creating Zendesk data source %s for subdomain %s in application %s, index %s",
+        config["dataSourceName"],
+        config["zendeskSubdomain"],
+        config["qbusinessApplicationId"],
+        config["qindexId"],
+    )
 
     # Create the data source
     response = qbusiness.create_data_source(**create_params)
@@ -2,17 +2,35 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+import logging
 import os
 import time
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Pooled HTTP session for Zendesk API calls, kept for the life of the container. The retry
+# policy leaves the non-idempotent client creation POST alone.
+http = requests.Session()
+http.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=25,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
 
-def handler(event, context):
-    """Function handler."""
 
+def handler(event, context):
+    """Function handler for creating a Zendesk OAuth application."""
     try:
-        print(f"Received event: {event}")
+        logger.debug("Received event: %s", event)
 
         # Get API Gateway URL for redirect URI
         api_gateway_url = os.environ.get("API_GATEWAY_URL", "")
@@ -21,10 +39,10 @@ def handler(event, context):
         return create_oauth_app(event, redirect_uri)
 
     except requests.exceptions.RequestException as e:
-        print(f"Request error: {str(e)}")
+        logger.error("Request error: %s", e)
         return {"statusCode": 500, "body": json.dumps({"error": "Zendesk API Error", "message": str(e)})}
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return {"statusCode": 500, "body": json.dumps({"error": "Internal Server Error", "message": str(e)})}
 
 
@@ -48,9 +66,9 @@ def create_oauth_app(event, redirect_uri):
         }
     }
 
-    print(f"Creating OAuth client with payload: {json.dumps(payload)}")
+    logger.info("Creating OAuth client %s for %s", payload["client"]["identifier"], zendesk_subdomain)
 
-    response = requests.post(
+    response = http.post(
         api_url,
         json=payload,
         auth=(f"{admin_email}/token", api_token),
@@ -59,10 +77,10 @@ def create_oauth_app(event, redirect_uri):
     )
 
     response.raise_for_status()
-    response_data = response.json()
+    response_data = orjson.loads(response.content)
 
     # Log only non-sensitive information
-    print(f"Zendesk API response received. Status: success, Client ID: {response_data['client']['identifier']}")
+    logger.info("Zendesk API response received. Status: success, Client ID: %s", response_data["client"]["identifier"])
 
     client_id = response_data["client"]["identifier"]
     client_secret = response_data["client"]["secret"]
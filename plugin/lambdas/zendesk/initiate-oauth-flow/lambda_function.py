@@ -2,22 +2,46 @@
 # SPDX-License-Identifier: MIT-0
 
 import json
+import logging
 import os
+import secrets
 import time
 import urllib.parse
-import uuid
+from functools import lru_cache
 
-import boto3
+import orjson
+from botocore.config import Config
+from botocore.session import get_session
+from zendesk_common import parse_body
 
-# Initialize AWS clients
-dynamodb = boto3.resource("dynamodb")
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Keep-alive pooled connections and tight timeouts for the state table writes
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    connect_timeout=1.0,
+    read_timeout=5.0,
+    tcp_keepalive=True,
+)
+
+# Initialize AWS clients directly from botocore, which is all the state write needs
+_SESSION = get_session()
+dynamodb = _SESSION.create_client("dynamodb", config=BOTO_CONFIG)
+
+# State table written by the OAuth flow, read once at load time
+_STATE_TABLE_NAME = os.environ.get("STATE_TABLE_NAME")
+
+# Callback URL Zendesk redirects the browser to after authorization
+_REDIRECT_URI = f"{os.environ.get('API_GATEWAY_URL', '')}zendesk-oauth-callback"
 
 
 def handler(event, context):
     """Function handler."""
 
     try:
-        print(f"Received event: {event}")
+        logger.debug("Received event: %s", event)
 
         # Parse the request body
         body = parse_body(event)
@@ -31,21 +55,17 @@ def handler(event, context):
         if not client_id or not client_secret or not zendesk_subdomain:
             return {
                 "statusCode": 400,
-                "body": json.dumps(
+                "body": orjson.dumps(
                     {
                         "error": "Missing Required Parameters",
                         "message": "Please provide clientId, clientSecret, and zendeskSubdomain",
                         "requiredParameters": ["clientId", "clientSecret", "zendeskSubdomain"],
                     }
-                ),
+                ).decode(),
             }
 
-        # Get API Gateway URL for redirect URI
-        api_gateway_url = os.environ.get("API_GATEWAY_URL", "")
-        redirect_uri = f"{api_gateway_url}zendesk-oauth-callback"
-
-        # Generate state for CSRF protection
-        state = str(uuid.uuid4())
+        # Generate state for CSRF protection, 128 random bits as a 22-character URL-safe token
+        state = secrets.token_urlsafe(16)
 
         # Store state in DynamoDB
         store_state(
@@ -53,38 +73,26 @@ def handler(event, context):
         )
 
         # Build authorization URL
-        auth_url = build_auth_url(zendesk_subdomain, client_id, redirect_uri, state)
+        auth_url = build_auth_url(zendesk_subdomain, client_id, _REDIRECT_URI, state)
 
         return {
             "statusCode": 200,
-            "body": json.dumps(
+            "body": orjson.dumps(
                 {
                     "authorizationUrl": auth_url,
                     "message": "Please visit this URL to authorize Amazon Q Business to access your Zendesk data",
                     "instructions": "After authorization, you will be redirected back to Amazon Q Business to complete the setup process.",
                 }
-            ),
+            ).decode(),
         }
     except Exception as e:
-        print(f"Error: {str(e)}")
-        return {"statusCode": 500, "body": json.dumps({"error": "Internal Server Error", "message": str(e)})}
-
-
-def parse_body(event):
-    """Parse the API Gateway event body"""
-    if "body-json" in event:
-        return event["body-json"]
-
-    if "body" in event:
-        if isinstance(event["body"], str):
-            return json.loads(event["body"])
-        return event["body"]
+        logger.error("Error: %s", e)
+        return {"statusCode": 500, "body": orjson.dumps({"error": "Internal Server Error", "message": str(e)}).decode()}
 
-    return {}
 
-
-def build_auth_url(zendesk_subdomain, client_id, redirect_uri, state):
-    """Build the Zendesk OAuth authorization URL"""
+@lru_cache(maxsize=64)
+def _auth_url_prefix(zendesk_subdomain, client_id, redirect_uri):
+    """Build the Zendesk OAuth authorization URL up to the per-request state parameter"""
     base_url = f"https://{zendesk_subdomain}.zendesk.com/oauth/authorizations/new"
 
     params = {
@@ -92,34 +100,39 @@ def build_auth_url(zendesk_subdomain, client_id, redirect_uri, state):
         "client_id": client_id,
         "redirect_uri": redirect_uri,
         "scope": "read write",
-        "state": state,
     }
 
     query_string = urllib.parse.urlencode(params)
     return f"{base_url}?{query_string}"
 
 
+def build_auth_url(zendesk_subdomain, client_id, redirect_uri, state):
+    """Build the Zendesk OAuth authorization URL"""
+    return f"{_auth_url_prefix(zendesk_subdomain, client_id, redirect_uri)}&state={urllib.parse.quote_plus(state)}"
+
+
 def store_state(state, data, ttl_seconds=3600):
     """Store state in DynamoDB with TTL"""
-    table_name = os.environ.get("STATE_TABLE_NAME")
-    if not table_name:
+    if not _STATE_TABLE_NAME:
         raise ValueError("STATE_TABLE_NAME environment variable not set")
 
-    table = dynamodb.Table(table_name)
-
     # Calculate expiration time
     expires = int(time.time()) + ttl_seconds
 
-    # Store the state
-    table.put_item(Item={"id": state, "data": json.dumps(data), "expires": expires})
+    # Store the state, one string attribute per field
+    item = {key: {"S": value} for key, value in data.items()}
+    item["id"] = {"S": state}
+    item["expires"] = {"N": str(expires)}
+    dynamodb.put_item(TableName=_STATE_TABLE_NAME, Item=item)
 
     return state
 
 
 # For local testing
 if __name__ == "__main__":
-    os.environ["API_GATEWAY_URL"] = "https://example.com/"
-    os.environ["STATE_TABLE_NAME"] = "zendesk-oauth-state"
+    # The environment is read at import, so set the resolved module globals directly
+    _STATE_TABLE_NAME = "zendesk-oauth-state"
+    _REDIRECT_URI = "https://example.com/zendesk-oauth-callback"
 
     test_event = {
         "body-json": {"clientId": "test-client-id", "clientSecret": "test-client-secret", "zendeskSubdomain": "example"}
@@ -2,26 +2,109 @@
 # SPDX-License-Identifier: MIT-0
 
 import html as html_escape  # Import html module for escaping
-import json
+import logging
 import os
-import time
+import string
 
-import boto3
+import urllib3
+from zendesk_oauth import complete_authorization
 
-# Initialize AWS clients
-dynamodb = boto3.resource("dynamodb")
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Page shown once the token is stored; it has no request values, so it is built once per container
+_SUCCESS_PAGE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Zendesk OAuth Callback</title>
+        <style>
+            body {
+                font-family: Arial, sans-serif;
+                margin: 0;
+                padding: 20px;
+                background-color: #f5f5f5;
+            }
+            .container {
+                max-width: 600px;
+                margin: 0 auto;
+                background-color: white;
+                padding: 20px;
+                border-radius: 5px;
+                box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
+            }
+            h1 {
+                color: #333;
+            }
+            .success {
+                color: #2ecc71;
+                font-weight: bold;
+            }
+        </style>
+        <meta http-equiv="Content-Security-Policy" content="default-src 'self'; style-src 'unsafe-inline'">
+    </head>
+    <body>
+        <div class="container">
+            <h1>Zendesk OAuth Authorization</h1>
+            <p><span class="success">Success! Token has been stored securely.</span></p>
+            <p>You can now close this window and return to Amazon Q Business.</p>
+        </div>
+    </body>
+    </html>
+    """
+
+# Error page parsed once per container; only the escaped title and message are substituted per call
+_ERROR_PAGE_TEMPLATE = string.Template("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>${safe_title}</title>
+        <style>
+            body {
+                font-family: Arial, sans-serif;
+                margin: 0;
+                padding: 20px;
+                background-color: #f5f5f5;
+            }
+            .container {
+                max-width: 600px;
+                margin: 0 auto;
+                background-color: white;
+                padding: 20px;
+                border-radius: 5px;
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            }
+            .error {
+                color: #e74c3c;
+            }
+            h1 {
+                margin-top: 0;
+            }
+        </style>
+        <!-- Add Content Security Policy header -->
+        <meta http-equiv="Content-Security-Policy" content="default-src 'self'; style-src 'unsafe-inline'">
+    </head>
+    <body>
+        <div class="container">
+            <h1 class="error">${safe_title}</h1>
+            <p>${safe_message}</p>
+        </div>
+    </body>
+    </html>
+    """)
 
 
 def handler(event, context):
     """
     Handle OAuth callback from Zendesk
-    
+
     This function processes the OAuth callback from Zendesk, validates the state
-    and code parameters, and returns an HTML page that automatically exchanges
-    the authorization code for an access token.
+    and code parameters, exchanges the authorization code for an access token,
+    stores it in Secrets Manager and returns an HTML result page.
     """
     try:
-        print(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", _safe_event(event))
 
         # Get query parameters - handle both direct and nested formats
         query_params = event.get("queryStringParameters", {}) or {}
@@ -30,18 +113,17 @@ def handler(event, context):
         if (not query_params.get("code") or not query_params.get("state")) and event.get("params", {}).get(
             "querystring"
         ):
-            print("Using nested query parameters from event.params.querystring")
+            logger.info("Using nested query parameters from event.params.querystring")
             query_params = event.get("params", {}).get("querystring", {})
 
-        print(f"Query parameters: {json.dumps(query_params)}")
+        logger.debug("Query parameters: %s", _redact_code(query_params))
 
         code = query_params.get("code")
         state = query_params.get("state")
         error = query_params.get("error")
         error_description = query_params.get("error_description")
 
-        print(f"Code: {code}")
-        print(f"State: {state}")
+        logger.debug("State: %s", state)
 
         # Check for errors from Zendesk
         if error:
@@ -52,162 +134,59 @@ def handler(event, context):
         if not code or not state:
             return build_error_page("Bad Request", "Missing required parameters: code, state")
 
-        # Retrieve state from DynamoDB
-        state_data = get_state(state)
-        if not state_data:
+        # Claim the state, exchange the code and store the token in one pass
+        if not complete_authorization(code, state):
             return build_error_page("Invalid State", "The state parameter is invalid or expired")
 
-        # Check if the state has expired
-        now = int(time.time())
-        if "expires" in state_data and state_data["expires"] < now:
-            return build_error_page("Expired State", "The authorization session has expired")
-
-        # Get the API Gateway URL from environment variables
-        api_gateway_url = os.environ.get("API_GATEWAY_URL", "")
-
-        # Return an HTML page that posts the code to the exchange endpoint
-        return build_auto_exchange_page(code, state, api_gateway_url)
+        return build_success_page()
 
+    except urllib3.exceptions.HTTPError as e:
+        logger.error("Request error: %s", e)
+        return build_error_page("Zendesk API Error", str(e))
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return build_error_page("Server Error", str(e))
 
 
-def get_state(state):
-    """Retrieve state from DynamoDB"""
-    table_name = os.environ.get("STATE_TABLE_NAME")
-    if not table_name:
-        raise ValueError("STATE_TABLE_NAME environment variable not set")
+def _safe_event(event):
+    """Return a sanitized copy of the event for logging, the authorization code is a live credential"""
+    safe_event = dict(event)
+    if event.get("queryStringParameters"):
+        safe_event["queryStringParameters"] = _redact_code(event["queryStringParameters"])
+    if event.get("params", {}).get("querystring"):
+        safe_event["params"] = {**event["params"], "querystring": _redact_code(event["params"]["querystring"])}
+    return safe_event
 
-    table = dynamodb.Table(table_name)
 
-    response = table.get_item(Key={"id": state})
+def _redact_code(query_params):
+    """Return a copy of the query parameters with the authorization code masked"""
+    if "code" not in query_params:
+        return query_params
+    return {**query_params, "code": "***REDACTED***"}
 
-    if "Item" not in response:
-        return None
 
-    item = response["Item"]
-
-    # Parse the data
-    if "data" in item:
-        return json.loads(item["data"])
-
-    return item
-
-
-def build_auto_exchange_page(code, state, api_gateway_url):
-    """
-    Build an HTML page that automatically exchanges the authorization code for a token
-    
-    This follows the pattern from the example in the Zendesk connector agent.
-    """
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Zendesk OAuth Callback</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }}
-            .container {{
-                max-width: 600px;
-                margin: 0 auto;
-                background-color: white;
-                padding: 20px;
-                border-radius: 5px;
-                box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
-            }}
-            h1 {{
-                color: #333;
-            }}
-            .loader {{
-                border: 5px solid #f3f3f3;
-                border-top: 5px solid #3498db;
-                border-radius: 50%;
-                width: 50px;
-                height: 50px;
-                animation: spin 2s linear infinite;
-                margin: 20px auto;
-            }}
-            @keyframes spin {{
-                0% {{ transform: rotate(0deg); }}
-                100% {{ transform: rotate(360deg); }}
-            }}
-            .error {{
-                color: #e74c3c;
-                font-weight: bold;
-            }}
-            .success {{
-                color: #2ecc71;
-                font-weight: bold;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Zendesk OAuth Authorization</h1>
-            <p>Authorization successful! Exchanging code for access token...</p>
-            <div class="loader" id="loader"></div>
-            <p id="status">Please wait...</p>
-        </div>
-        
-        <script>
-            // Function to exchange the code for an access token
-            async function exchangeCode() {{
-                try {{
-                    const apiUrl = '{api_gateway_url}zendesk-exchange-auth-code-for-token';
-                    console.log('Exchanging code at URL:', apiUrl);
-                    
-                    const response = await fetch(apiUrl, {{
-                        method: 'POST',
-                        headers: {{
-                            'Content-Type': 'application/json'
-                        }},
-                        body: JSON.stringify({{
-                            code: '{code}',
-                            state: '{state}'
-                        }})
-                    }});
-                    
-                    const data = await response.json();
-                    
-                    if (response.ok) {{
-                        document.getElementById('loader').style.display = 'none';
-                        document.getElementById('status').innerHTML = '<span class="success">Success! Token has been stored securely.</span><br><br>You can now close this window and return to Amazon Q Business.';
-                    }} else {{
-                        document.getElementById('loader').style.display = 'none';
-                        document.getElementById('status').innerHTML = '<span class="error">Error: ' + (data.message || 'Failed to exchange code for token') + '</span>';
-                        console.error('Error response:', data);
-                    }}
-                }} catch (error) {{
-                    document.getElementById('loader').style.display = 'none';
-                    document.getElementById('status').innerHTML = '<span class="error">Error: ' + error.message + '</span>';
-                    console.error('Exception:', error);
-                }}
-            }}
-            
-            // Exchange the code when the page loads
-            window.onload = exchangeCode;
-        </script>
-    </body>
-    </html>
-    """
-
-    return {"statusCode": 200, "headers": {"Content-Type": "text/html"}, "body": html, "isBase64Encoded": False}
+def build_success_page():
+    """Build the HTML page shown after the token has been stored"""
+    return {
+        "statusCode": 200,
+        "headers": {
+            "Content-Type": "text/html",
+            "Content-Security-Policy": "default-src 'self'; style-src 'unsafe-inline'",
+            "X-Content-Type-Options": "nosniff",
+        },
+        "body": _SUCCESS_PAGE,
+        "isBase64Encoded": False,
+    }
 
 
 def build_error_page(title, message):
     """
     Build an HTML error page with proper escaping to prevent XSS
-    
+
     Args:
         title (str): Page title
         message (str): Error message
-        
+
     Returns:
         dict: API Gateway response object
     """
@@ -215,44 +194,7 @@ def build_error_page(title, message):
     safe_title = html_escape.escape(title)
     safe_message = html_escape.escape(message)
 
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{safe_title}</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }}
-            .container {{
-                max-width: 600px;
-                margin: 0 auto;
-                background-color: white;
-                padding: 20px;
-                border-radius: 5px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .error {{
-                color: #e74c3c;
-            }}
-            h1 {{
-                margin-top: 0;
-            }}
-        </style>
-        <!-- Add Content Security Policy header -->
-        <meta http-equiv="Content-Security-Policy" content="default-src 'self'; style-src 'unsafe-inline'">
-    </head>
-    <body>
-        <div class="container">
-            <h1 class="error">{safe_title}</h1>
-            <p>{safe_message}</p>
-        </div>
-    </body>
-    </html>
-    """
+    html = _ERROR_PAGE_TEMPLATE.substitute(safe_title=safe_title, safe_message=safe_message)
 
     return {
         "statusCode": 400,
@@ -269,8 +211,11 @@ def build_error_page(title, message):
 
 # For local testing
 if __name__ == "__main__":
-    os.environ["STATE_TABLE_NAME"] = "zendesk-oauth-state"
-    os.environ["API_GATEWAY_URL"] = "https://example.com/prod/"
+    import zendesk_oauth
+
+    # The layer reads the environment at import, so set its resolved module globals directly
+    zendesk_oauth._STATE_TABLE_NAME = "zendesk-oauth-state"
+    zendesk_oauth._REDIRECT_URI = "https://example.com/prod/zendesk-oauth-callback"
 
     test_event = {"queryStringParameters": {"code": "test-auth-code", "state": "test-state"}}
 
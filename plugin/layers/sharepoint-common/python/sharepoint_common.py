@@ -0,0 +1,55 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import msal
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Scope needed for application management through Microsoft Graph
+GRAPH_SCOPES = ["https://graph.microsoft.com/.default"]
+
+# Pooled HTTP session for Microsoft Graph calls, created on first use and kept for the life of the
+# container. urllib3 only retries idempotent methods by default, so POST and PATCH are never replayed.
+_SESSION = None
+
+# MSAL confidential clients per tenant and app credentials; their token cache serves warm invocations
+_MSAL_APPS = {}
+
+
+def session():
+    """Return the shared requests session used for Microsoft Graph calls."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        _SESSION.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=25,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+            ),
+        )
+    return _SESSION
+
+
+def graph_token(tenant_id, client_id, client_secret):
+    """
+    Get a Microsoft Graph API access token using the client credentials flow
+
+    The MSAL client is kept per tenant and app credentials, so a warm invocation gets the token from
+    MSAL's in-memory cache until it expires.
+    """
+    app_key = (tenant_id, client_id, client_secret)
+    app = _MSAL_APPS.get(app_key)
+    if app is None:
+        authority = f"https://login.microsoftonline.com/{tenant_id}"
+        app = msal.ConfidentialClientApplication(
+            client_id=client_id, client_credential=client_secret, authority=authority
+        )
+        _MSAL_APPS[app_key] = app
+
+    result = app.acquire_token_for_client(scopes=GRAPH_SCOPES)
+    if "access_token" not in result:
+        raise Exception(f"Failed to acquire token: {result.get('error_description', 'Unknown error')}")
+    return result["access_token"]
@@ -0,0 +1,17 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import orjson
+
+
+def parse_body(event):
+    """Parse the API Gateway event body"""
+    if "body-json" in event:
+        return event["body-json"]
+
+    if "body" in event:
+        if isinstance(event["body"], str):
+            return orjson.loads(event["body"])
+        return event["body"]
+
+    return {}
@@ -0,0 +1,158 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+import os
+import time
+
+import orjson
+import urllib3
+from botocore.config import Config
+from botocore.session import get_session
+
+logger = logging.getLogger()
+
+# Short timeouts so a stalled DynamoDB or Secrets Manager call fails fast instead of holding the exchange
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    connect_timeout=1.0,
+    read_timeout=5.0,
+    tcp_keepalive=True,
+)
+
+# Initialize AWS clients from a botocore session; boto3's session and resource layers are never imported
+_SESSION = get_session()
+secretsmanager = _SESSION.create_client("secretsmanager", config=BOTO_CONFIG)
+dynamodb = _SESSION.create_client("dynamodb", config=BOTO_CONFIG)
+
+# Connection pool for the Zendesk token endpoint; urllib3 is already loaded by botocore. POST is not an
+# idempotent method for urllib3, so only connection failures are retried and a code is never redeemed twice.
+http = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=8,
+    retries=urllib3.util.Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+)
+
+# OAuth state table, resolved once per container instead of on every request
+_STATE_TABLE_NAME = os.environ.get("STATE_TABLE_NAME")
+
+# String attributes stored on each state item by initiate-oauth-flow
+_STATE_FIELDS = ("clientId", "clientSecret", "zendeskSubdomain")
+
+# OAuth redirect URI registered with Zendesk, derived from the API Gateway URL
+_REDIRECT_URI = f"{os.environ.get('API_GATEWAY_URL', '')}zendesk-oauth-callback"
+
+
+def complete_authorization(code, state):
+    """
+    Exchange an authorization code for an access token and store it in Secrets Manager
+
+    Returns a (zendesk_subdomain, secret_name, token_data) tuple, or None when the state is invalid or expired.
+    Errors from the Zendesk token endpoint are raised as urllib3.exceptions.HTTPError.
+    """
+    # Retrieve and remove the state from DynamoDB in one call, so the code can only be exchanged once
+    state_data = consume_state(state)
+    if not state_data:
+        return None
+
+    # Get client credentials from state
+    client_id = state_data.get("clientId")
+    client_secret = state_data.get("clientSecret")
+    zendesk_subdomain = state_data.get("zendeskSubdomain")
+
+    # Exchange code for token
+    token_data = exchange_code_for_token(zendesk_subdomain, client_id, client_secret, code, _REDIRECT_URI)
+
+    # Extract the numerical part from the client ID
+    unique_id = client_id.split("-")[-1]  # e.g., "amazon-q-business-1750882988" -> "1750882988"
+
+    # Store token in Secrets Manager
+    secret_name = f"qbusiness-zendesk-secret-{zendesk_subdomain}-{unique_id}"
+    store_token(secret_name, token_data, zendesk_subdomain)
+
+    return zendesk_subdomain, secret_name, token_data
+
+
+def consume_state(state):
+    """Delete an unexpired state from DynamoDB and return its data"""
+    if not _STATE_TABLE_NAME:
+        raise ValueError("STATE_TABLE_NAME environment variable not set")
+
+    # Expired items are left for the table's TTL on expires to remove
+    try:
+        response = dynamodb.delete_item(
+            TableName=_STATE_TABLE_NAME,
+            Key={"id": {"S": state}},
+            ConditionExpression="attribute_exists(id) AND (attribute_not_exists(expires) OR expires >= :now)",
+            ExpressionAttributeValues={":now": {"N": str(int(time.time()))}},
+            ReturnValues="ALL_OLD",
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        return None
+
+    item = response.get("Attributes", {})
+    if "clientId" not in item:
+        return None
+
+    return {field: item[field]["S"] for field in _STATE_FIELDS if field in item}
+
+
+def exchange_code_for_token(zendesk_subdomain, client_id, client_secret, code, redirect_uri):
+    """Exchange authorization code for access token"""
+    token_url = f"https://{zendesk_subdomain}.zendesk.com/oauth/tokens"
+
+    # Prepare request data
+    data = {
+        "grant_type": "authorization_code",
+        "code": code,
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "redirect_uri": redirect_uri,
+        "scope": "read write",
+    }
+
+    # Make request to token endpoint with timeout
+    response = http.request_encode_body("POST", token_url, fields=data, encode_multipart=False, timeout=30.0)
+    if response.status >= 400:
+        # Keep Zendesk's error body, it says why the code was rejected (e.g. invalid_grant)
+        raise urllib3.exceptions.HTTPError(
+            f"{response.status} Error for url: {token_url}: {response.data.decode(errors='replace')}"
+        )
+
+    # Parse response
+    token_data = orjson.loads(response.data)
+
+    # Add expiry timestamp if not present
+    if "expires_in" in token_data and "expires_at" not in token_data:
+        token_data["expires_at"] = int(time.time()) + token_data["expires_in"]
+
+    return token_data
+
+
+def store_token(secret_name, token_data, zendesk_subdomain):
+    """Store token in AWS Secrets Manager"""
+    try:
+        # Create a simplified secret value with only the required fields
+        secret_value = {
+            "accessToken": token_data.get("access_token"),
+            "hostUrl": f"https://{zendesk_subdomain}.zendesk.com/",
+        }
+
+        secret_string = orjson.dumps(secret_value).decode()
+
+        # Re-authorizing an existing subdomain is the common case, so write a new version first
+        try:
+            secretsmanager.put_secret_value(SecretId=secret_name, SecretString=secret_string)
+        except secretsmanager.exceptions.ResourceNotFoundException:
+            # Secret doesn't exist, create it
+            secretsmanager.create_secret(
+                Name=secret_name,
+                SecretString=secret_string,
+                Description=f"Zendesk OAuth token for {zendesk_subdomain}",
+            )
+
+        return True
+    except Exception as e:
+        logger.error("Error storing token in Secrets Manager: %s", e)
+        raise